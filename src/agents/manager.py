@@ -37,6 +37,8 @@ class ManagerAgent:
         - task: A clear, specific instruction for the agent
         - repeat_condition: (optional) A condition that determines if this task should be repeated
         - output_format: (optional) The format in which the worker should provide their output (e.g., "json", "text", "code")
+        - timeout: (optional) Maximum number of seconds the agent may spend on the task
+        - deadline: (optional) Number of seconds after the run starts by which the task should begin; tasks with earlier deadlines are run first
 
         Available API models: {get_available_api_providers()}
         Available local models: {get_available_local_models()}
@@ -4,20 +4,35 @@ import sys
 from pathlib import Path
 import uuid
 import logging
+import heapq
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 # Add project root to Python path
 project_root = str(Path(__file__).parent.parent.parent)
 sys.path.append(project_root)
 
 from src.agents.worker import WorkerAgent
+from src.utils.latency import LatencyHistory
 # from agents.manager import ManagerAgent  # Uncomment if needed later
 
+DEADLINE_TOLERANCE = 0.1  # Seconds late a task may start before a missed deadline is logged
+DEFAULT_MAX_WORKERS = 4
+
 class Router:
-    def __init__(self):
+    def __init__(self, task_timeout: float = None, run_timeout: float = None, latency: LatencyHistory = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
         self.results = {}
         self.task_dependencies = {}
         self.agent_tasks = {}  # Track tasks by agent
         self.task_to_agent = {}  # Map task IDs to their agent IDs
+        self.task_timeout = task_timeout  # Default per-task timeout in seconds
+        self.run_timeout = run_timeout  # Budget in seconds for all worker tasks, counted from the first execution
+        self.run_start = None  # Set by the first execution; deadline hints are relative to it
+        self.run_deadline = None
+        self.max_workers = max_workers  # Worker tasks allowed to run at the same time
+        self.latency = latency or LatencyHistory()
         self.logger = logging.getLogger(__name__)
         self.logger.info("\n=== Router Initialized ===")
 
@@ -34,11 +49,14 @@ class Router:
         self.logger.info(f"  Normalized task ID: {task_id} -> {normalized_id}")
         return normalized_id
 
-    def execute_manager_output(self, manager_output: str):
-        self.logger.info("\n=== Starting Task Execution ===")
-        self.logger.info(f"Received manager output: {manager_output}")
-        
-        payload = ast.literal_eval(manager_output)
+    def build_task_graph(self, manager_output: str | dict) -> dict:
+        """
+        Parse a manager plan into a validated dependency graph keyed by normalized task ID.
+
+        The graph only holds JSON-compatible values, so it can be cached and passed back
+        to execute_manager_output later without being rebuilt.
+        """
+        payload = ast.literal_eval(manager_output) if isinstance(manager_output, str) else manager_output
 
         try:
             agents = payload["agents"]
@@ -50,100 +68,243 @@ class Router:
         
         # First pass: collect all tasks and their dependencies
         self.logger.info("\n=== Planning Task Dependencies ===")
+        graph = {}
+        task_to_agent = dict(self.task_to_agent)
         for agent_spec in agents:
             agent_id = agent_spec.get("agent_id", f"worker-{uuid.uuid4().hex[:8]}")
             task_id = agent_spec.get("task_id", str(uuid.uuid4().hex[:8]))
             full_task_id = self._normalize_task_id(task_id, agent_id)
             
             # Store the mapping of task_id to agent_id
-            self.task_to_agent[task_id] = agent_id
+            task_to_agent[task_id] = agent_id
             
             depends_on = agent_spec.get("depends_on", [])
             # Normalize all dependency task IDs using the correct agent IDs
-            depends_on = [self._normalize_task_id(dep, self.task_to_agent.get(dep)) for dep in depends_on]
+            depends_on = [self._normalize_task_id(dep, task_to_agent.get(dep)) for dep in depends_on]
             
             task_info = f"\nTask: {full_task_id}\n  Agent: {agent_id}\n  Dependencies: {depends_on}\n  Task description: {agent_spec['task']}"
             self.logger.info(task_info)
             
-            self.task_dependencies[full_task_id] = {
+            graph[full_task_id] = {
                 "spec": agent_spec,
+                "task_id": task_id,
                 "depends_on": depends_on,
-                "completed": False,
-                "agent_id": agent_id
+                "agent_id": agent_id,
+                "timeout": self._spec_seconds(agent_spec, "timeout", full_task_id, allow_zero=False),
+                "deadline": self._spec_seconds(agent_spec, "deadline", full_task_id)
             }
-            
-            # Track tasks by agent
-            if agent_id not in self.agent_tasks:
-                self.agent_tasks[agent_id] = []
-            self.agent_tasks[agent_id].append(full_task_id)
 
         # Validate dependencies before execution
         self.logger.info("\n=== Validating Dependencies ===")
-        for task_id, task_info in self.task_dependencies.items():
+        for task_id, task_info in graph.items():
             for dep_id in task_info["depends_on"]:
-                if dep_id not in self.task_dependencies:
+                if dep_id not in graph and dep_id not in self.task_dependencies:
                     error_msg = f"Missing dependency: {dep_id} required by {task_id}"
                     self.logger.error(error_msg)
                     raise ValueError(error_msg)
 
-        # Add maximum iteration limit
-        MAX_ITERATIONS = 1000
-        iteration = 0
-        
-        while any(not task["completed"] for task in self.task_dependencies.values()):
-            iteration += 1
-            if iteration > MAX_ITERATIONS:
-                incomplete_tasks = [tid for tid, info in self.task_dependencies.items() 
-                                  if not info["completed"]]
-                error_msg = f"Maximum iterations exceeded. Tasks still pending: {incomplete_tasks}"
+        checked = set()
+        visiting = set()
+
+        def check_cycles(task_id):
+            if task_id in checked or task_id not in graph:
+                return
+            if task_id in visiting:
+                error_msg = f"Circular dependency detected at {task_id}"
                 self.logger.error(error_msg)
-                raise RuntimeError(error_msg)
-            
-            iteration_info = f"\nIteration {iteration}\nPending tasks: {[tid for tid, info in self.task_dependencies.items() if not info['completed']]}"
-            self.logger.info(iteration_info)
+                raise ValueError(error_msg)
+            visiting.add(task_id)
+            for dep_id in graph[task_id]["depends_on"]:
+                check_cycles(dep_id)
+            visiting.discard(task_id)
+            checked.add(task_id)
+
+        for task_id in graph:
+            check_cycles(task_id)
+
+        return graph
+
+    def execute_manager_output(self, manager_output: str | dict, task_graph: dict = None):
+        """
+        Execute a manager plan, given either as the manager's raw output or as an
+        already parsed payload. A task graph from build_task_graph (e.g. one loaded
+        from the plan cache) skips parsing and validation entirely.
+        """
+        self.logger.info("\n=== Starting Task Execution ===")
+        self.logger.info(f"Received manager output: {manager_output}")
+
+        if self.run_start is None:
+            self.run_start = time.monotonic()
+            if self.run_timeout:
+                self.run_deadline = self.run_start + self.run_timeout
+
+        if task_graph is None:
+            task_graph = self.build_task_graph(manager_output)
+
+        for full_task_id, task_info in task_graph.items():
+            agent_id = task_info["agent_id"]
+            self.task_to_agent[task_info["task_id"]] = agent_id
+            self.task_dependencies[full_task_id] = {**task_info, "completed": False}
             
-            for task_id, task_info in self.task_dependencies.items():
-                if task_info["completed"]:
-                    continue
-
-                # Check if all dependencies are completed
-                if all(dep in self.results for dep in task_info["depends_on"]):
-                    task_exec_info = f"\nExecuting task: {task_id}"
-                    self.logger.info(task_exec_info)
-                    
-                    agent_spec = task_info["spec"]
-                    llm_type = agent_spec.get("llm_type")
-                    model = agent_spec.get("model")
-                    task = agent_spec["task"]
-                    
-                    if "api_provider" in agent_spec:
-                        provider = agent_spec.get("api_provider")
-                        provider_info = f"  Using {provider} provider with model {model}"
-                        self.logger.info(provider_info)
-                        
-                    config = {
-                        "llm_type": llm_type,
-                        "api_provider": provider,
-                        "model": model
-                    } if provider else {
-                        "llm_type": llm_type,
-                        "model": model
-                    }
-
-                    worker = WorkerAgent(config)
-                    self.logger.info("  Starting worker execution...")
-                    result = worker.handle_task(task)
-                    self.logger.info("  Worker completed successfully")
-                    
+            # Track tasks by agent
+            if agent_id not in self.agent_tasks:
+                self.agent_tasks[agent_id] = []
+            self.agent_tasks[agent_id].append(full_task_id)
+
+        # Order ready tasks by deadline hint first, then by longest remaining downstream path,
+        # and start them as worker slots free up
+        self.logger.info("\n=== Scheduling Tasks ===")
+        critical_paths = self._critical_path_lengths()
+        order = {task_id: index for index, task_id in enumerate(self.task_dependencies)}
+        ready = []
+        queued = set()
+
+        def push_if_ready(task_id):
+            task_info = self.task_dependencies[task_id]
+            if task_info["completed"] or task_id in queued:
+                return
+            if not all(dep in self.results for dep in task_info["depends_on"]):
+                return
+            queued.add(task_id)
+            deadline = task_info["deadline"] if task_info["deadline"] is not None else math.inf
+            heapq.heappush(ready, (deadline, -critical_paths[task_id], order[task_id], task_id))
+
+        for task_id in self.task_dependencies:
+            push_if_ready(task_id)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        running = {}  # Future -> (task_id, start time)
+        try:
+            while ready or running:
+                while ready and len(running) < self.max_workers:
+                    deadline, neg_path, _, task_id = heapq.heappop(ready)
+                    future = self._start_task(executor, task_id, deadline, -neg_path)
+                    running[future] = (task_id, time.monotonic())
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_id, started = running.pop(future)
+                    task_info = self.task_dependencies[task_id]
+                    try:
+                        result = future.result()
+                    except TimeoutError as e:
+                        error_msg = f"Task {task_id} timed out: {e}"
+                        self.logger.error(error_msg)
+                        raise TimeoutError(error_msg) from e
+                    self.latency.record(LatencyHistory.key(task_info["spec"]), time.monotonic() - started)
+                    self.logger.info(f"  Worker for task {task_id} completed successfully")
+
                     # Store the result with the full task ID
                     self.results[task_id] = result
                     task_info["completed"] = True
                     completion_info = f"  Task {task_id} marked as completed"
                     self.logger.info(completion_info)
-                else:
-                    waiting_info = f"  Task {task_id} waiting for dependencies: {[dep for dep in task_info['depends_on'] if dep not in self.results]}"
-                    self.logger.info(waiting_info)
+
+                    for dependent_id in self._dependents(task_id):
+                        push_if_ready(dependent_id)
+        finally:
+            # Tasks still queued are cancelled; running calls end on their own timeouts
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        incomplete_tasks = [tid for tid, info in self.task_dependencies.items() if not info["completed"]]
+        if incomplete_tasks:
+            error_msg = f"No runnable tasks left. Tasks still pending: {incomplete_tasks}"
+            self.logger.error(error_msg)
+            raise RuntimeError(error_msg)
 
         completion_msg = "\n=== All Tasks Completed ==="
         self.logger.info(completion_msg)
-        return self.results
\ No newline at end of file
+        return self.results
+
+    def _start_task(self, executor: ThreadPoolExecutor, task_id: str, deadline: float, critical_path: float):
+        task_info = self.task_dependencies[task_id]
+        task_exec_info = f"\nExecuting task: {task_id} (critical path: {critical_path:.1f}s)"
+        self.logger.info(task_exec_info)
+
+        elapsed = time.monotonic() - self.run_start
+        if deadline != math.inf and elapsed - deadline >= DEADLINE_TOLERANCE:
+            self.logger.warning(f"  Task {task_id} started {elapsed - deadline:.1f}s past its deadline of {deadline}s")
+
+        agent_spec = task_info["spec"]
+        llm_type = agent_spec.get("llm_type")
+        model = agent_spec.get("model")
+        provider = agent_spec.get("api_provider")
+
+        if provider:
+            provider_info = f"  Using {provider} provider with model {model}"
+            self.logger.info(provider_info)
+
+        config = {
+            "llm_type": llm_type,
+            "api_provider": provider,
+            "model": model
+        } if provider else {
+            "llm_type": llm_type,
+            "model": model
+        }
+        timeout = task_info["timeout"] if task_info["timeout"] is not None else self.task_timeout
+        config["timeout"] = self._task_timeout(task_id, timeout)
+
+        worker = WorkerAgent(config)
+        self.logger.info("  Starting worker execution...")
+        return executor.submit(worker.handle_task, agent_spec["task"])
+
+    def _dependents(self, task_id: str) -> list:
+        return [tid for tid, info in self.task_dependencies.items() if task_id in info["depends_on"]]
+
+    def _spec_seconds(self, agent_spec: dict, field: str, task_id: str, allow_zero: bool = True) -> float | None:
+        """
+        Read an optional non-negative (or, without allow_zero, positive) number of seconds
+        from a task spec. Invalid values are logged and ignored rather than failing the run.
+        """
+        value = agent_spec.get(field)
+        if value is None:
+            return None
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            seconds = math.nan
+        if not (seconds >= 0 and math.isfinite(seconds)) or (seconds == 0 and not allow_zero):
+            self.logger.warning(f"  Ignoring invalid {field} {value!r} for task {task_id}")
+            return None
+        return seconds
+
+    def _critical_path_lengths(self) -> dict:
+        """
+        Estimate, for every pending task, the time from its start until the end of the
+        longest chain of tasks that depends on it, using historical model latency.
+        """
+        lengths = {}
+        visiting = set()
+
+        def path_length(task_id):
+            if task_id in lengths:
+                return lengths[task_id]
+            if task_id in visiting:
+                error_msg = f"Circular dependency detected at {task_id}"
+                self.logger.error(error_msg)
+                raise ValueError(error_msg)
+            visiting.add(task_id)
+            task_info = self.task_dependencies[task_id]
+            estimate = 0.0 if task_info["completed"] else self.latency.estimate(LatencyHistory.key(task_info["spec"]))
+            downstream = [path_length(dep_id) for dep_id in self._dependents(task_id)]
+            visiting.discard(task_id)
+            lengths[task_id] = estimate + max(downstream, default=0.0)
+            return lengths[task_id]
+
+        for task_id in self.task_dependencies:
+            path_length(task_id)
+        return lengths
+
+    def _task_timeout(self, task_id: str, timeout: float = None) -> float:
+        """
+        Clamp a task's timeout to whatever is left of the run budget.
+        """
+        if self.run_deadline is None:
+            return timeout
+        remaining = self.run_deadline - time.monotonic()
+        if remaining <= 0:
+            error_msg = f"Run timeout exceeded before task {task_id} could start"
+            self.logger.error(error_msg)
+            raise TimeoutError(error_msg)
+        return min(float(timeout), remaining) if timeout else remaining
@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 from typing import Dict
 from pathlib import Path
 
@@ -8,11 +9,13 @@ project_root = str(Path(__file__).parent.parent.parent)
 sys.path.append(project_root)
 
 # LLM Client Providers
-from openai import OpenAI # ChatGPT, DeepSeek, Grok
+from openai import OpenAI, APITimeoutError # ChatGPT, DeepSeek, Grok
 import anthropic # Claude
 from google import genai # Gemini
+from google.genai import types as genai_types
 
-from ollama import ChatResponse, chat
+import httpx
+from ollama import ChatResponse, Client as OllamaClient
 
 from src.utils.ollama_tools import ollama_model_installed
 
@@ -33,6 +36,12 @@ API_LLM_PROVIDERS = [
     "xai"
 ]
 
+def _timeout_kwargs(timeout: float = None) -> Dict:
+    # Only pass a timeout when one is set so each client keeps its own default otherwise.
+    # This is a per network operation limit that lets abandoned calls (see LLMAccess.call)
+    # wind down; retries are disabled since the call's total budget is already fixed.
+    return {"timeout": timeout, "max_retries": 0} if timeout else {}
+
 class LLMAccess:
     """
     A unified access layer for different LLM providers.
@@ -50,11 +59,13 @@ class LLMAccess:
           - api_provider: The name of the LLM provider.
           - model: Model identifier string.
           - role_description: (optional) A system prompt for the model.
+          - timeout: (optional) Total seconds a call may take before giving up.
         """
         self.llm_type = config.get('llm_type')
         self.api_provider = config.get('api_provider')
         self.model = config.get('model')
         self.role_description = config.get('role_description', [])
+        self.timeout = config.get('timeout')
 
         if self.llm_type not in ('api', 'local'):
             raise ValueError("config 'type' must be either 'api' or 'local'")
@@ -67,11 +78,47 @@ class LLMAccess:
         """
         Call the underlying LLM with the provided prompt.
 
-        Additional parameters can be passed via kwargs.
+        Additional parameters can be passed via kwargs. A `timeout` kwarg
+        overrides the configured timeout for this call only.
         
         Returns:
             The generated response as a string.
+
+        Raises:
+            TimeoutError: If the provider does not respond within the timeout.
         """
+        timeout = kwargs.pop('timeout', self.timeout)
+        timeout = float(timeout) if timeout else None
+        timeout_msg = f"{self.api_provider or self.llm_type} model {self.model} timed out after {timeout}s"
+
+        if timeout is None:
+            return self._dispatch(prompt, **kwargs)
+
+        # Client timeouts only bound each network operation (connect, read, ...), so the
+        # call runs in a daemon thread that is abandoned once the total budget is spent
+        outcome = {}
+
+        def run():
+            try:
+                outcome["result"] = self._dispatch(prompt, timeout=timeout, **kwargs)
+            except (APITimeoutError, anthropic.APITimeoutError, httpx.TimeoutException) as e:
+                outcome["error"] = TimeoutError(timeout_msg)
+                outcome["error"].__cause__ = e
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout)
+
+        if thread.is_alive():
+            raise TimeoutError(timeout_msg)
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+
+    def _dispatch(self, prompt: str, **kwargs) -> str:
         if self.llm_type == 'api':
             if self.api_provider == 'openai':
                 return self._call_openai(prompt, **kwargs)
@@ -98,8 +145,8 @@ class LLMAccess:
             raise ValueError(f"Unsupported llm_type: {self.llm_type}")
 
 
-    def _call_openai(self, prompt: str, role_description: str = None, **kwargs) -> str:
-        client = OpenAI(api_key=OPENAI_API_KEY)
+    def _call_openai(self, prompt: str, role_description: str = None, timeout: float = None, **kwargs) -> str:
+        client = OpenAI(api_key=OPENAI_API_KEY, **_timeout_kwargs(timeout))
         
         messages = [
                 {"role": "developer", "content": role_description},
@@ -114,8 +161,8 @@ class LLMAccess:
         return response.choices[0].message.content
 
 
-    def _call_anthropic(self, prompt: str, role_description: str = None, **kwargs) -> str:
-        client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    def _call_anthropic(self, prompt: str, role_description: str = None, timeout: float = None, **kwargs) -> str:
+        client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, **_timeout_kwargs(timeout))
         
         response = client.messages.create(
             model=self.model,
@@ -129,8 +176,10 @@ class LLMAccess:
         return response.content[0].text
     
     
-    def _call_google(self, prompt: str, role_description: str = None, **kwargs) -> str:
-        client = genai.Client(api_key=GOOGLE_API_KEY)
+    def _call_google(self, prompt: str, role_description: str = None, timeout: float = None, **kwargs) -> str:
+        # The genai client expects its timeout in milliseconds
+        http_options = genai_types.HttpOptions(timeout=int(timeout * 1000)) if timeout else None
+        client = genai.Client(api_key=GOOGLE_API_KEY, http_options=http_options)
 
         response = client.models.generate_content(
             model=self.model,
@@ -141,8 +190,8 @@ class LLMAccess:
         return response.text
     
     
-    def _call_deepseek(self, prompt: str, role_description: str = None, **kwargs) -> str:
-        client = OpenAI(api_key=DEEPSEEK_API_KEY, base_url="https://api.deepseek.com")
+    def _call_deepseek(self, prompt: str, role_description: str = None, timeout: float = None, **kwargs) -> str:
+        client = OpenAI(api_key=DEEPSEEK_API_KEY, base_url="https://api.deepseek.com", **_timeout_kwargs(timeout))
 
         response = client.chat.completions.create(
             model="deepseek-chat",
@@ -156,10 +205,11 @@ class LLMAccess:
         return response.choices[0].message.content
     
     
-    def _call_xai(self, prompt: str, role_description: str = None, **kwargs) -> str:
+    def _call_xai(self, prompt: str, role_description: str = None, timeout: float = None, **kwargs) -> str:
         client = OpenAI(
             api_key=XAI_API_KEY,
             base_url="https://api.x.ai/v1",
+            **_timeout_kwargs(timeout)
         )
 
         completion = client.chat.completions.create(
@@ -173,11 +223,12 @@ class LLMAccess:
         return completion.choices[0].message.content
     
 
-    def _call_local(self, prompt: str, role_description: str = None, **kwargs) -> str:
+    def _call_local(self, prompt: str, role_description: str = None, timeout: float = None, **kwargs) -> str:
         model_installed = ollama_model_installed(self.model)
 
         if model_installed:
-            response: ChatResponse = chat(model=self.model, messages=[
+            client = OllamaClient(timeout=timeout)
+            response: ChatResponse = client.chat(model=self.model, messages=[
                 {"role": "system", "content": role_description},
                 {"role": "user", "content": prompt}
             ])
@@ -8,10 +8,23 @@ import uuid
 project_root = str(Path(__file__).parent.parent.parent)
 sys.path.append(project_root)
 
-from agents.router import Router
+from agents.router import Router, DEFAULT_MAX_WORKERS
 from agents.manager import ManagerAgent
 from agents.worker import WorkerAgent
 from src.utils.logging import setup_logging
+from src.utils.plan_cache import PlanCache
+
+def positive_float(value: str) -> float:
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number of seconds, got {value}")
+    return number
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 def main():
     # Setup logging
@@ -28,25 +41,55 @@ def main():
     parser.add_argument("--type", "-l", dest="llm_type", required=True, help="LLM type: 'api' or 'local'")
     parser.add_argument("--provider", "-p", dest="api_provider", required=False, help="LLM provider, e.g., 'openai', 'ollama'")
     parser.add_argument("--model", "-m", required=True, help="LLM model name")
+    
+    # Timeout arguments
+    parser.add_argument("--task-timeout", dest="task_timeout", type=positive_float, help="Maximum seconds for any single LLM call")
+    parser.add_argument("--run-timeout", dest="run_timeout", type=positive_float, help="Maximum seconds for all worker tasks in the run")
+    parser.add_argument("--max-workers", dest="max_workers", type=positive_int, default=DEFAULT_MAX_WORKERS, help="Maximum number of worker tasks to run at the same time")
+    
+    # Plan cache arguments
+    parser.add_argument("--no-plan-cache", dest="use_plan_cache", action="store_false", help="Always ask the manager for a new plan")
+    parser.add_argument("--refresh-plan", action="store_true", help="Replace the cached plan for this task with a new one")
+    parser.add_argument("--template", help="Run a saved plan template instead of asking the manager")
+    parser.add_argument("--save-template", help="Save this run's plan as a template with the given name")
+    parser.add_argument("--param", action="append", default=[], help="Template parameter as key=value (repeatable)")
 
     args = parser.parse_args()
-    config_info = f"\nConfiguration:\n  LLM Type: {args.llm_type}\n  Provider: {args.api_provider}\n  Model: {args.model}"
+    config_info = f"\nConfiguration:\n  LLM Type: {args.llm_type}\n  Provider: {args.api_provider}\n  Model: {args.model}\n  Task Timeout: {args.task_timeout}\n  Run Timeout: {args.run_timeout}\n  Max Workers: {args.max_workers}"
     logger.info(config_info)
     
+    params = {}
+    for param in args.param:
+        key, sep, value = param.partition("=")
+        if not sep or not key.isidentifier():
+            raise ValueError(f"Invalid template parameter: {param} (expected key=value)")
+        params[key] = value
+    if args.save_template:
+        PlanCache.check_params(params)
+    
+    plan_cache = PlanCache()
+    template_plan = None
+    
     # Use the task from either positional or named argument
     task = args.task_arg if args.task_arg else args.task
+    if args.template:
+        template_task, template_plan = plan_cache.instantiate_template(args.template, params)
+        task = task or template_task
+        logger.info(f"\nUsing plan template: {args.template} {params}")
+    
     if not task:
         raise ValueError("Task is required")  # Default task if none provided
     
     task_info = f"\nTask: {task}"
     logger.info(task_info)
     
-    router = Router()
+    router = Router(task_timeout=args.task_timeout, run_timeout=args.run_timeout, max_workers=args.max_workers)
     
     manager_config = {
         "llm_type": args.llm_type,
         "api_provider": args.api_provider,
-        "model": args.model
+        "model": args.model,
+        "timeout": args.task_timeout
     }
     manager = ManagerAgent(manager_config)
     manager_info = f"\nManager Agent initialized with ID: {manager.id}"
@@ -60,18 +103,47 @@ def main():
         iteration_info = f"\n=== Starting Iteration {iteration} ==="
         logger.info(iteration_info)
         
-        # Get manager's plan
-        logger.info("\nRequesting task plan from manager...")
-        manager_output = manager.plan_task(task, previous_results)
-        logger.info("Received plan from manager")
+        # Reuse a template or cached plan for the first iteration when one exists
+        payload = None
+        task_graph = None
+        cached = None
+        cacheable = previous_results is None and args.use_plan_cache and not template_plan
+        if previous_results is None and template_plan:
+            payload = template_plan
+        elif cacheable and not args.refresh_plan:
+            cached = plan_cache.get(task, manager_config)
+        
+        if cached:
+            logger.info("\nUsing cached plan, skipping manager planning")
+            payload, task_graph = cached
+            cacheable = False
+        elif payload is None:
+            # Get manager's plan
+            logger.info("\nRequesting task plan from manager...")
+            manager_output = manager.plan_task(task, previous_results)
+            logger.info("Received plan from manager")
+            payload = ast.literal_eval(manager_output)
+        
+        if task_graph is None:
+            task_graph = router.build_task_graph(payload)
         
         # Execute the plan
         logger.info("\nExecuting manager's plan...")
-        results = router.execute_manager_output(manager_output)
+        results = router.execute_manager_output(payload, task_graph=task_graph)
+        
+        # Only plans that executed successfully are kept for reuse
+        if cacheable:
+            plan_cache.store(task, manager_config, payload, task_graph)
+        if args.save_template and previous_results is None:
+            # A template that cannot be saved should not cost the results of a finished run
+            try:
+                plan_cache.save_template(args.save_template, task, payload, params)
+                logger.info(f"\nSaved plan template: {args.save_template}")
+            except ValueError as e:
+                logger.error(f"\nCould not save plan template {args.save_template}: {e}")
         
         # Check if any tasks need to be repeated
         logger.info("\nChecking for tasks that need repetition...")
-        payload = ast.literal_eval(manager_output)
         needs_repetition = False
         
         for agent_spec in payload["agents"]:
@@ -0,0 +1,36 @@
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+def load_json(path: Path) -> dict | None:
+    """
+    Load a JSON file, returning {} if it does not exist yet.
+    Returns None (after logging a warning) if the file exists but cannot be read,
+    so callers can avoid overwriting it.
+    """
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {path} ({e}); leaving it untouched until it is fixed or removed")
+        return None
+
+def write_json_atomic(path: Path, data: dict):
+    """
+    Write JSON to a temporary file and move it into place, so readers never see a partial file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump(data, tmp_file, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
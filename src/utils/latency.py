@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from src.utils.json_store import load_json, write_json_atomic
+
+DEFAULT_HISTORY_FILE = Path("logs") / "latency_history.json"
+DEFAULT_ESTIMATE = 10.0  # Seconds assumed for a model with no recorded calls
+MAX_SAMPLES = 20
+
+class LatencyHistory:
+    """
+    Rolling record of how long each model takes to complete a task.
+
+    Samples are keyed by "provider/model" and persisted as JSON so that
+    estimates carry over between runs.
+    """
+
+    def __init__(self, path: Path = DEFAULT_HISTORY_FILE, max_samples: int = MAX_SAMPLES):
+        self.path = Path(path)
+        self.max_samples = max_samples
+        samples = load_json(self.path)
+        # An unreadable file is left alone so its history is not overwritten
+        self.writable = samples is not None
+        self.samples = samples or {}
+
+    @staticmethod
+    def key(spec: dict) -> str:
+        return f"{spec.get('api_provider') or spec.get('llm_type')}/{spec.get('model')}"
+
+    def estimate(self, key: str) -> float:
+        samples = self.samples.get(key)
+        if not samples:
+            return DEFAULT_ESTIMATE
+        return sum(samples) / len(samples)
+
+    def record(self, key: str, seconds: float):
+        samples = self.samples.setdefault(key, [])
+        samples.append(seconds)
+        del samples[:-self.max_samples]
+        self._save()
+
+    def _save(self):
+        if self.writable:
+            write_json_atomic(self.path, self.samples)
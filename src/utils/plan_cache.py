@@ -0,0 +1,213 @@
+import argparse
+import copy
+import hashlib
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from string import Template
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+sys.path.append(project_root)
+
+from src.utils.json_store import load_json, write_json_atomic
+
+DEFAULT_CACHE_FILE = Path("plans") / "plan_cache.json"
+MAX_CACHED_PLANS = 100
+
+def normalize_task(task: str) -> str:
+    """
+    Reduce a task to the form used for cache lookups: lowercase, single-spaced,
+    without surrounding whitespace or trailing punctuation.
+    """
+    return re.sub(r"\s+", " ", task).strip().rstrip(".!?").strip().lower()
+
+def _map_task_fields(task: str, payload: dict, fn) -> tuple[str, dict]:
+    # Templates only vary the task text and each agent's task instruction; ids,
+    # models and repeat conditions are kept exactly as planned
+    payload = copy.deepcopy(payload)
+    for agent_spec in payload["agents"]:
+        agent_spec["task"] = fn(agent_spec["task"])
+    return fn(task), payload
+
+class PlanCache:
+    """
+    Stores validated manager plans so repeat tasks can skip the planning call.
+
+    Plans are keyed by the normalized task text and the manager's LLM config, and are
+    stored with the Router's validated task graph so they can be handed straight to
+    Router.execute_manager_output. The least recently used plans are
+    evicted once more than `max_plans` are cached. Named templates hold plans with
+    $placeholders that are filled in with new arguments on each use.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_FILE, max_plans: int = MAX_CACHED_PLANS):
+        self.path = Path(path)
+        self.max_plans = max_plans
+        data = load_json(self.path)
+        # An unreadable file is left alone so cached plans and templates are not overwritten
+        self.writable = data is not None
+        data = data or {}
+        self.plans = data.get("plans", {})
+        self.templates = data.get("templates", {})
+
+    @staticmethod
+    def key(task: str, config: dict) -> str:
+        # Plans name the models that were available to the manager, so a different
+        # manager config must not reuse them
+        parts = [normalize_task(task), config.get("llm_type"), config.get("api_provider"), config.get("model")]
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def get(self, task: str, config: dict) -> tuple[dict, dict] | None:
+        """
+        Look up a cached plan. Returns the plan payload and its task graph.
+        """
+        entry = self.plans.get(self.key(task, config))
+        if entry is None:
+            return None
+        entry["last_used"] = time.time()
+        entry["hits"] += 1
+        self._save()
+        return entry["payload"], entry["graph"]
+
+    def store(self, task: str, config: dict, payload: dict, graph: dict):
+        now = time.time()
+        self.plans[self.key(task, config)] = {
+            "task": task,
+            "normalized_task": normalize_task(task),
+            "config": {key: config.get(key) for key in ("llm_type", "api_provider", "model")},
+            "payload": payload,
+            "graph": graph,
+            "created": now,
+            "last_used": now,
+            "hits": 0
+        }
+        self._evict()
+        self._save()
+
+    def invalidate(self, task: str = None) -> int:
+        """
+        Drop the cached plans for a task under any config, or every cached plan if no
+        task is given. Returns the number of plans removed.
+        """
+        if task is None:
+            stale = list(self.plans)
+        else:
+            stale = [key for key, entry in self.plans.items() if entry["normalized_task"] == normalize_task(task)]
+        for key in stale:
+            del self.plans[key]
+        self._save()
+        return len(stale)
+
+    def save_template(self, name: str, task: str, payload: dict, params: dict):
+        """
+        Save a plan as a template, replacing whole-word occurrences of each parameter
+        value in the task text and agent task instructions with a ${name} placeholder.
+        """
+        self.check_params(params)
+
+        # One pass over the text, trying longer values first, so placeholders are never re-matched
+        escaped = {value.replace("$", "$$"): param for param, value in params.items()}
+        pattern = re.compile("|".join(
+            rf"(?<!\w){re.escape(value)}(?!\w)" for value in sorted(escaped, key=len, reverse=True)
+        )) if params else None
+        used = set()
+
+        def parameterize(text):
+            def placeholder(match):
+                param = escaped[match.group(0)]
+                used.add(param)
+                return f"${{{param}}}"
+            text = text.replace("$", "$$")
+            # Without parameters the plan is saved verbatim
+            return pattern.sub(placeholder, text) if pattern else text
+
+        template_task, template_payload = _map_task_fields(task, payload, parameterize)
+        unused = sorted(set(params) - used)
+        if unused:
+            raise ValueError(f"Template parameters not found as whole words in the task or agent tasks: {unused}")
+
+        self.templates[name] = {
+            "task": template_task,
+            "payload": template_payload,
+            "params": sorted(params),
+            "created": time.time()
+        }
+        self._save()
+
+    @staticmethod
+    def check_params(params: dict):
+        """
+        Reject template parameters that could never be matched in a plan.
+        """
+        empty = [param for param, value in params.items() if not value]
+        if empty:
+            raise ValueError(f"Template parameters cannot be empty: {empty}")
+        duplicated = [param for param, value in params.items() if list(params.values()).count(value) > 1]
+        if duplicated:
+            raise ValueError(f"Template parameters must have distinct values: {duplicated}")
+
+    def instantiate_template(self, name: str, params: dict) -> tuple[str, dict]:
+        """
+        Fill a saved template in with new arguments.
+        Returns the task text and the plan payload.
+        """
+        if name not in self.templates:
+            raise ValueError(f"Unknown plan template: {name}")
+        template = self.templates[name]
+
+        missing = [param for param in template["params"] if param not in params]
+        if missing:
+            raise ValueError(f"Missing parameters for template {name}: {missing}")
+
+        fill = lambda text: Template(text).substitute(params)
+        return _map_task_fields(template["task"], template["payload"], fill)
+
+    def delete_template(self, name: str) -> bool:
+        removed = self.templates.pop(name, None) is not None
+        self._save()
+        return removed
+
+    def _evict(self):
+        overflow = len(self.plans) - self.max_plans
+        if overflow > 0:
+            for key in sorted(self.plans, key=lambda k: self.plans[k]["last_used"])[:overflow]:
+                del self.plans[key]
+
+    def _save(self):
+        if self.writable:
+            write_json_atomic(self.path, {"plans": self.plans, "templates": self.templates})
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage TaskMaestro's cached plans and plan templates.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="List cached plans and templates")
+    invalidate_parser = subparsers.add_parser("invalidate", help="Drop the cached plans for a task")
+    invalidate_parser.add_argument("task", help="The task whose plan should be dropped")
+    subparsers.add_parser("clear", help="Drop every cached plan")
+    delete_parser = subparsers.add_parser("delete-template", help="Delete a plan template")
+    delete_parser.add_argument("name", help="The template name")
+
+    args = parser.parse_args()
+    cache = PlanCache()
+
+    if args.command == "list":
+        print(f"Cached plans ({len(cache.plans)}):")
+        for entry in cache.plans.values():
+            config = entry["config"]
+            print(f"  [{entry['hits']} hits] {entry['task']} ({config['api_provider'] or config['llm_type']}/{config['model']})")
+        print(f"Templates ({len(cache.templates)}):")
+        for name, template in cache.templates.items():
+            print(f"  {name}({', '.join(template['params'])}): {template['task']}")
+    elif args.command == "invalidate":
+        print(f"Removed {cache.invalidate(args.task)} cached plan(s)")
+    elif args.command == "clear":
+        print(f"Removed {cache.invalidate()} cached plan(s)")
+    elif args.command == "delete-template":
+        print("Template deleted" if cache.delete_template(args.name) else f"No template named {args.name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+for module in ("openai", "anthropic", "google.genai", "ollama", "httpx"):
+    pytest.importorskip(module)
+
+from src.llm.access import LLMAccess
+
+
+def test_call_is_abandoned_once_total_timeout_is_spent(monkeypatch):
+    llm = LLMAccess({"llm_type": "local", "model": "stub", "timeout": 0.05})
+    monkeypatch.setattr(llm, "_dispatch", lambda prompt, **kwargs: time.sleep(1))
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        llm.call("prompt")
+    assert time.monotonic() - started < 0.5
+
+
+def test_call_errors_are_raised_to_the_caller(monkeypatch):
+    llm = LLMAccess({"llm_type": "local", "model": "stub", "timeout": 1})
+
+    def fail(prompt, **kwargs):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(llm, "_dispatch", fail)
+    with pytest.raises(ValueError, match="boom"):
+        llm.call("prompt")
+
+
+def test_call_without_timeout_returns_result(monkeypatch):
+    llm = LLMAccess({"llm_type": "local", "model": "stub"})
+    monkeypatch.setattr(llm, "_dispatch", lambda prompt, **kwargs: f"echo: {prompt}")
+
+    assert llm.call("prompt") == "echo: prompt"
@@ -0,0 +1,83 @@
+import pytest
+
+from src.utils.plan_cache import PlanCache
+
+CONFIG = {"llm_type": "api", "api_provider": "openai", "model": "gpt-4o"}
+
+
+def plan(task="Describe a robotic robot in 800 words"):
+    return {"agents": [
+        {"task_id": "a", "agent_id": "worker-a", "depends_on": [], "llm_type": "api",
+         "api_provider": "openai", "model": "gpt-4o", "task": task},
+        {"task_id": "b", "agent_id": "worker-a", "depends_on": ["a"], "llm_type": "api",
+         "api_provider": "openai", "model": "gpt-4o", "task": "Proofread it",
+         "repeat_condition": "len(result) < 800"}
+    ]}
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "plan_cache.json"
+
+
+def test_round_trip_is_keyed_on_normalized_task_and_config(cache_path):
+    graph = {"worker-a_a": {"depends_on": []}}
+    PlanCache(cache_path).store("Write about a robot.", CONFIG, plan(), graph)
+
+    cache = PlanCache(cache_path)
+    assert cache.get("  write about a ROBOT ", CONFIG) == (plan(), graph)
+    assert cache.get("Write about a robot", {**CONFIG, "model": "gpt-4"}) is None
+
+
+def test_least_recently_used_plans_are_evicted(cache_path):
+    cache = PlanCache(cache_path, max_plans=2)
+    cache.store("first", CONFIG, plan(), {})
+    cache.store("second", CONFIG, plan(), {})
+    cache.get("first", CONFIG)
+    cache.store("third", CONFIG, plan(), {})
+
+    assert cache.get("first", CONFIG) is not None
+    assert cache.get("second", CONFIG) is None
+
+
+def test_invalidate_drops_task_under_every_config(cache_path):
+    cache = PlanCache(cache_path)
+    cache.store("task", CONFIG, plan(), {})
+    cache.store("task", {**CONFIG, "model": "gpt-4"}, plan(), {})
+    cache.store("other", CONFIG, plan(), {})
+
+    assert cache.invalidate("Task.") == 2
+    assert cache.get("other", CONFIG) is not None
+
+
+def test_template_only_replaces_whole_words_in_task_fields(cache_path):
+    cache = PlanCache(cache_path)
+    cache.save_template("story", "Write about a robot", plan(), {"subject": "robot", "words": "800"})
+
+    task, payload = PlanCache(cache_path).instantiate_template("story", {"subject": "dragon", "words": "500"})
+
+    assert task == "Write about a dragon"
+    assert payload["agents"][0]["task"] == "Describe a robotic dragon in 500 words"
+    assert payload["agents"][1]["repeat_condition"] == "len(result) < 800"
+    assert payload["agents"][1]["model"] == "gpt-4o"
+
+
+def test_template_without_params_is_saved_verbatim(cache_path):
+    cache = PlanCache(cache_path)
+    cache.save_template("fixed", "Spend $5", plan("Spend $5"), {})
+
+    assert cache.instantiate_template("fixed", {}) == ("Spend $5", plan("Spend $5"))
+
+
+@pytest.mark.parametrize("params", [{"n": "o"}, {"x": "robo"}, {"empty": ""}])
+def test_template_rejects_params_not_in_the_plan(cache_path, params):
+    with pytest.raises(ValueError):
+        PlanCache(cache_path).save_template("bad", "Write about a robot", plan(), params)
+
+
+def test_unreadable_cache_file_is_not_overwritten(cache_path):
+    cache_path.write_text("{not json")
+
+    PlanCache(cache_path).store("task", CONFIG, plan(), {})
+
+    assert cache_path.read_text() == "{not json"
@@ -0,0 +1,140 @@
+import importlib
+import sys
+import time
+import types
+
+import pytest
+
+from src.utils.latency import LatencyHistory
+
+
+class StubWorker:
+    """
+    Stands in for WorkerAgent so scheduling can be tested without calling an LLM.
+    Tasks whose text is a number sleep for that many seconds.
+    """
+    calls = []
+
+    def __init__(self, config):
+        self.config = config
+
+    def handle_task(self, task):
+        StubWorker.calls.append((task, self.config.get("timeout")))
+        try:
+            time.sleep(float(task))
+        except ValueError:
+            pass
+        return f"done: {task}"
+
+
+@pytest.fixture
+def router_module(monkeypatch):
+    worker_module = types.ModuleType("src.agents.worker")
+    worker_module.WorkerAgent = StubWorker
+    monkeypatch.setitem(sys.modules, "src.agents.worker", worker_module)
+    monkeypatch.delitem(sys.modules, "src.agents.router", raising=False)
+    StubWorker.calls = []
+    yield importlib.import_module("src.agents.router")
+    sys.modules.pop("src.agents.router", None)
+
+
+@pytest.fixture
+def make_router(router_module, tmp_path):
+    def make(**kwargs):
+        return router_module.Router(latency=LatencyHistory(tmp_path / "latency.json"), **kwargs)
+    return make
+
+
+def spec(task_id, depends_on=(), **extra):
+    agent_spec = {
+        "task_id": task_id,
+        "agent_id": "worker-a",
+        "depends_on": list(depends_on),
+        "llm_type": "local",
+        "model": "stub",
+        "task": task_id
+    }
+    agent_spec.update(extra)
+    return agent_spec
+
+
+def executed():
+    return [task for task, _ in StubWorker.calls]
+
+
+def test_longest_remaining_chain_runs_first(make_router):
+    router = make_router(max_workers=1)
+    router.execute_manager_output({"agents": [
+        spec("side"), spec("a"), spec("b", ["a"]), spec("c", ["b"])
+    ]})
+
+    assert executed()[0] == "a"
+    assert sorted(executed()) == ["a", "b", "c", "side"]
+
+
+def test_deadline_overrides_critical_path(make_router):
+    router = make_router(max_workers=1)
+    router.execute_manager_output({"agents": [
+        spec("a"), spec("b", ["a"]), spec("urgent", deadline=0)
+    ]})
+
+    assert executed()[0] == "urgent"
+
+
+def test_invalid_spec_values_are_ignored(make_router):
+    router = make_router(max_workers=1, task_timeout=7)
+    router.execute_manager_output({"agents": [
+        spec("a", timeout="0"), spec("b", deadline="5 min"), spec("c", timeout="30")
+    ]})
+
+    timeouts = dict(StubWorker.calls)
+    assert timeouts == {"a": 7, "b": 7, "c": 30.0}
+
+
+def test_task_timeout_is_clamped_to_run_budget(make_router):
+    router = make_router(max_workers=1, run_timeout=5)
+    router.execute_manager_output({"agents": [spec("a", timeout=30), spec("b", timeout=2)]})
+
+    timeouts = dict(StubWorker.calls)
+    assert 0 < timeouts["a"] <= 5
+    assert timeouts["b"] == 2
+
+
+def test_run_timeout_stops_remaining_tasks(make_router):
+    router = make_router(max_workers=1, run_timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        router.execute_manager_output({"agents": [spec("0.1"), spec("b", ["0.1"])]})
+    assert executed() == ["0.1"]
+
+
+def test_independent_tasks_run_concurrently(make_router):
+    router = make_router(max_workers=2)
+    started = time.monotonic()
+    router.execute_manager_output({"agents": [spec("0.2"), spec("0.20")]})
+
+    assert time.monotonic() - started < 0.35
+
+
+def test_tasks_are_not_rerun_across_executions(make_router):
+    router = make_router()
+    router.execute_manager_output({"agents": [spec("a_1", task="chain1")]})
+    router.execute_manager_output({"agents": [
+        spec("b_2", ["a_1"], task="chain2"), spec("c_3", ["b_2"], task="chain2-again")
+    ]})
+
+    assert executed() == ["chain1", "chain2", "chain2-again"]
+
+
+def test_cached_task_graph_skips_rebuilding(make_router):
+    payload = {"agents": [spec("a"), spec("b", ["a"])]}
+    graph = make_router().build_task_graph(payload)
+
+    results = make_router().execute_manager_output(payload, task_graph=graph)
+
+    assert results == {"worker-a_a": "done: a", "worker-a_b": "done: b"}
+
+
+def test_circular_dependencies_are_rejected(make_router):
+    with pytest.raises(ValueError, match="Circular dependency"):
+        make_router().build_task_graph({"agents": [spec("w_a", ["w_b"]), spec("w_b", ["w_a"])]})